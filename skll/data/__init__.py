@@ -16,7 +16,8 @@ from six import PY2
 
 from .featureset import FeatureSet
 from .readers import (ARFFReader, CSVReader, LibSVMReader, MegaMReader,
-                      NDJReader, TSVReader, safe_float, Reader)
+                      NDJReader, TSVReader, safe_float, safe_float_series,
+                      Reader)
 from .writers import (ARFFWriter, Writer, TSVWriter, CSVWriter,
                       LibSVMWriter, MegaMWriter, NDJWriter)
 
@@ -37,22 +37,99 @@ original labels to labels that convert only to ``str``.
 from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 
+import codecs
+import csv
+import json
 import logging
+import mmap
+import os
 import re
+import shlex
 import sys
-from itertools import islice
-from io import open, StringIO
+from contextlib import closing
+from io import open, StringIO, TextIOWrapper
+from multiprocessing import cpu_count
 
+import joblib
 import numpy as np
 import pandas as pd
+import scipy.sparse as sp
 from bs4 import UnicodeDammit
-from six import PY2, PY3, string_types, text_type
-from six.moves import zip
+from six import PY2, integer_types, string_types, text_type
+from six.moves import map, zip
 from sklearn.feature_extraction import FeatureHasher
 
 from skll.data import FeatureSet
 from skll.data.dict_vectorizer import DictVectorizer
 
+# The logger used by `safe_float()` when it is not given one; it is
+# looked up once here because `safe_float()` is called very often
+_MODULE_LOGGER = logging.getLogger(__name__)
+
+# Patterns used by `safe_float()` to recognize strings that are
+# definitely floats, or that definitely are not, so that it does
+# not have to rely on catching the errors from failed conversions
+_FLOAT_RE = re.compile(r'(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?$', re.UNICODE)
+_DIGIT_RE = re.compile(r'\d', re.UNICODE)
+_NON_FINITE_FLOATS = frozenset(['nan', 'inf', 'infinity'])
+
+# The types of the values that `safe_float()` can return as they are;
+# booleans are not included since they are converted to text
+_NUMERIC_TYPES = integer_types + (float,)
+
+# The row that starts the data in an ARFF file; the
+# keyword is case-insensitive and may be padded with spaces
+_ARFF_DATA_RE = re.compile(br'^[ \t]*@data[ \t]*\r?$\n?',
+                           re.IGNORECASE | re.MULTILINE)
+
+# The ARFF attribute types whose values are always numbers
+_ARFF_NUMERIC_TYPES = frozenset(['numeric', 'real', 'integer'])
+
+# Use orjson to parse NDJ files if it is available
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
+# Check if a supported version of pyarrow is available for the faster
+# CSV/TSV parser; it has to be 2.0 or newer to turn tables into data
+# frames without copying them, and versions from 12.0 on refuse to
+# work with pandas before 1.0
+try:
+    import pyarrow
+    import pyarrow.csv as pa_csv
+except ImportError:
+    _PYARROW_VERSION = None
+else:
+    _PYARROW_VERSION = pyarrow.__version__
+
+
+def _is_supported_pyarrow_version(pyarrow_version, pandas_version):
+    """
+    Check whether the given version of `pyarrow` can be used
+    for reading CSV and TSV files with the given version of `pandas`.
+
+    Parameters
+    ----------
+    pyarrow_version : str
+        The version of `pyarrow`, e.g., ``'5.0.0'``.
+    pandas_version : str
+        The version of `pandas`, e.g., ``'0.25.3'``.
+
+    Returns
+    -------
+    supported : bool
+        Whether that version of `pyarrow` is supported.
+    """
+    pyarrow_major = int(re.match(r'\d+', pyarrow_version).group())
+    pandas_major = int(re.match(r'\d+', pandas_version).group())
+    return pyarrow_major >= 2 and (pandas_major >= 1 or pyarrow_major < 12)
+
+
+_HAVE_PYARROW = (_PYARROW_VERSION is not None and
+                 _is_supported_pyarrow_version(_PYARROW_VERSION,
+                                               pd.__version__))
+
 
 class Reader(object):
     """
@@ -105,12 +182,22 @@ class Reader(object):
         A logger instance to use to log messages instead of creating
         a new one by default.
         Defaults to ``None``.
+    n_jobs : int, optional
+        The number of processes to use for parsing MegaM and LibSVM
+        files, which are split into chunks of whole lines that are
+        parsed independently. Negative values are interpreted as
+        in ``joblib``, e.g., -1 means using all CPUs.
+        Defaults to 1.
+    dtype : type, optional
+        The type of the feature values in the vectorized feature
+        matrix, e.g., ``np.float32`` to halve its memory footprint.
+        Defaults to ``np.float64``.
     """
 
     def __init__(self, path_or_list, quiet=True, ids_to_floats=False,
                  label_col='y', id_col='id', class_map=None, sparse=True,
                  feature_hasher=False, num_features=None,
-                 logger=None):
+                 logger=None, n_jobs=1, dtype=np.float64):
         super(Reader, self).__init__()
         self.path_or_list = path_or_list
         self.quiet = quiet
@@ -118,15 +205,39 @@ class Reader(object):
         self.label_col = label_col
         self.id_col = id_col
         self.class_map = class_map
+        self.n_jobs = n_jobs
         self._progress_msg = ''
         self._use_pandas = False
+        # set when all of the example IDs were generated by
+        # the reader itself and are therefore already unique
+        self._generated_ids = False
 
         if feature_hasher:
-            self.vectorizer = FeatureHasher(n_features=num_features)
+            self.vectorizer = FeatureHasher(n_features=num_features,
+                                            dtype=dtype)
         else:
-            self.vectorizer = DictVectorizer(sparse=sparse)
+            self.vectorizer = DictVectorizer(sparse=sparse, dtype=dtype)
         self.logger = logger if logger else logging.getLogger(__name__)
 
+    def __getstate__(self):
+        """
+        Return the attributes that should be pickled, e.g., when the
+        reader is sent to the processes that read a file in parallel.
+        We need this because we cannot pickle loggers with handlers.
+        """
+        attribute_dict = dict(self.__dict__)
+        if 'logger' in attribute_dict:
+            del attribute_dict['logger']
+        return attribute_dict
+
+    def __setstate__(self, state):
+        """
+        Restore the pickled attributes and use the module logger
+        in place of the one that was not pickled.
+        """
+        self.__dict__.update(state)
+        self.logger = logging.getLogger(__name__)
+
     @classmethod
     def for_path(cls, path_or_list, **kwargs):
         """
@@ -157,12 +268,13 @@ class Reader(object):
         else:
             # Get lowercase extension for file extension checking
             ext = '.' + path_or_list.rsplit('.', 1)[-1].lower()
-            if ext not in EXT_TO_READER:
+            reader_type = EXT_TO_READER.get(ext)
+            if reader_type is None:
                 raise ValueError(('Example files must be in either .arff, '
                                   '.csv, .jsonlines, .megam, .ndj, or .tsv '
                                   'format. You specified: '
                                   '{}').format(path_or_list))
-        return EXT_TO_READER[ext](path_or_list, **kwargs)
+        return reader_type(path_or_list, **kwargs)
 
     def _sub_read(self, f):
         """
@@ -209,6 +321,49 @@ class Reader(object):
                   end=end, file=sys.stderr)
             sys.stderr.flush()
 
+    def _iter_rows(self, path):
+        """
+        Iterate over the examples in the file, parsing chunks of
+        the file in parallel if ``n_jobs`` is not 1. This is only
+        used by `Reader` objects that read row-by-row.
+
+        Parameters
+        ----------
+        path : str
+            The path to the file.
+
+        Yields
+        ------
+        curr_id : str
+            The current ID for the example.
+        class_name : float or str
+            The name of the class label for the example.
+        example : dict
+            The example valued in dictionary format.
+        """
+        n_jobs = self.n_jobs
+        if n_jobs is None or n_jobs == 1:
+            with closing(_iter_mmap_lines(path)) as lines:
+                for row in self._sub_read(lines):
+                    yield row
+            return
+
+        num_chunks = n_jobs if n_jobs > 0 else max(cpu_count() + 1 + n_jobs, 1)
+        chunk_ranges = _chunk_line_ranges(path, num_chunks)
+        parallel = joblib.Parallel(n_jobs=n_jobs)
+        chunks = parallel(joblib.delayed(_read_rows_chunk)(self, path, start, end)
+                          for start, end in chunk_ranges)
+
+        # IDs can only be generated once we know how many examples
+        # were in all of the preceding chunks
+        example_num = 0
+        for chunk in chunks:
+            for curr_id, class_name, curr_info_dict in chunk:
+                if curr_id is None:
+                    curr_id = 'EXAMPLE_{}'.format(example_num)
+                example_num += 1
+                yield curr_id, class_name, curr_info_dict
+
     def _sub_read_rows(self, path):
         """
         Read the file in row-by-row. This method is used for
@@ -241,53 +396,54 @@ class Reader(object):
         ValueError
             If the example IDs are not unique.
         """
-        # Get labels and IDs
+        # Get labels, IDs, and features in a single pass over the file
         ids = []
         labels = []
+        features = []
         ex_num = 0
-        with open(path, 'r' if PY3 else 'rb') as f:
-            for ex_num, (id_, class_, _) in enumerate(self._sub_read(f), start=1):
+        # there is no need to check for progress on
+        # every example if nothing will get printed
+        print_progress = None if self.quiet else self._print_progress
+        with closing(self._iter_rows(path)) as rows:
+            for ex_num, (id_, class_, feat_dict) in enumerate(rows, start=1):
 
                 # Update lists of IDs, classes, and features
-                if self.ids_to_floats:
-                    try:
-                        id_ = float(id_)
-                    except ValueError:
-                        raise ValueError(('You set ids_to_floats to true,'
-                                          ' but ID {} could not be '
-                                          'converted to float in '
-                                          '{}').format(id_,
-                                                       self.path_or_list))
                 ids.append(id_)
                 labels.append(class_)
-                if ex_num % 100 == 0:
-                    self._print_progress(ex_num)
+                features.append(feat_dict)
+                if print_progress is not None and ex_num % 100 == 0:
+                    print_progress(ex_num)
             self._print_progress(ex_num)
 
-        # Remember total number of examples for percentage progress meter
-        total = ex_num
-        if total == 0:
+        if ex_num == 0:
             raise ValueError("No features found in possibly "
                              "empty file '{}'.".format(self.path_or_list))
 
-        # Convert everything to numpy arrays
-        ids = np.array(ids)
+        # Convert everything to numpy arrays; if `ids_to_floats` is
+        # True, the IDs are converted straight into a float array
+        # rather than one Python float object at a time
+        if self.ids_to_floats:
+            try:
+                ids = np.array(ids, dtype=np.float64)
+            except ValueError:
+                for id_ in ids:
+                    try:
+                        float(id_)
+                    except ValueError:
+                        raise ValueError(('You set ids_to_floats to true,'
+                                          ' but ID {} could not be '
+                                          'converted to float in '
+                                          '{}').format(id_,
+                                                       self.path_or_list))
+                raise
+        else:
+            ids = np.array(ids)
         labels = np.array(labels)
 
-        def feat_dict_generator():
-            with open(self.path_or_list, 'r' if PY3 else 'rb') as f:
-                for ex_num, (_, _, feat_dict) in enumerate(self._sub_read(f)):
-                    yield feat_dict
-                    if ex_num % 100 == 0:
-                        self._print_progress('{:.8}%'.format(100 * ((ex_num / total))))
-                self._print_progress("100%")
-
-        # extract the features dictionary
-        features = feat_dict_generator()
-
         return ids, labels, features
 
-    def _parse_dataframe(self, df, id_col, label_col, features=None):
+    def _parse_dataframe(self, df, id_col, label_col, features=None,
+                         first_example_num=0):
         """
         Parse the data frame into ids, labels, and features.
         For `Reader` objects that rely on `pandas`, this function
@@ -309,6 +465,10 @@ class Reader(object):
             if not, then they will be extracted
             from the data frame.
             Defaults to None.
+        first_example_num : int, optional
+            The number to use for the first automatically
+            generated example ID, if there is no id column.
+            Defaults to 0.
 
         Returns
         -------
@@ -316,8 +476,10 @@ class Reader(object):
             The ids for the feature set.
         labels : np.array
             The labels for the feature set.
-        features : list of dicts
-            The features for the feature set.
+        features : list or iterator of dicts, or scipy.sparse.csr_matrix
+            The features for the feature set. This will be an already
+            hashed matrix if a ``FeatureHasher`` is used and all of
+            the features are numeric.
         """
         if df.empty:
             raise ValueError("No features found in possibly "
@@ -335,9 +497,17 @@ class Reader(object):
             if self.ids_to_floats:
                 ids = ids.astype(float)
             ids = ids.values
+            # store string ids in a typed array
+            # instead of an array of Python objects
+            if (ids.dtype == object and
+                    pd.api.types.infer_dtype(ids, skipna=False) == 'string'):
+                ids = ids.astype(text_type)
         else:
             # create ids with the prefix `EXAMPLE_`
-            ids = np.array(['EXAMPLE_{}'.format(i) for i in range(df.shape[0])])
+            self._generated_ids = True
+            example_nums = np.arange(first_example_num,
+                                     first_example_num + df.shape[0])
+            ids = np.char.add('EXAMPLE_', example_nums.astype(text_type))
 
         # if the label column exists,
         # get them from the data frame and
@@ -348,25 +518,318 @@ class Reader(object):
             del df[label_col]
             # if `class_map` exists, then
             # map the new classes to the labels;
-            # otherwise, just convert them to floats
-            if self.class_map is not None:
-                labels = labels.apply(safe_float,
-                                      replace_dict=self.class_map)
-            else:
-                labels = labels.apply(safe_float)
+            # otherwise, just convert them to floats;
+            # numeric columns would be left unchanged
+            # by `safe_float()` so we can skip those
+            if (self.class_map is not None or
+                    labels.dtype.kind not in 'iuf'):
+                labels = safe_float_series(labels,
+                                           replace_dict=self.class_map,
+                                           logger=self.logger)
             labels = labels.values
         else:
             # create an array of Nones
             labels = np.array([None] * df.shape[0])
 
         # convert the remaining features to
-        # a list of dictionaries, if no
-        # features argument was passed
+        # an iterator of dictionaries, if no
+        # features argument was passed; we walk
+        # the columns directly instead of using
+        # `df.to_dict()` so that the dictionaries
+        # are created lazily for the vectorizer
+        if features is None and self._can_hash_dataframe(df):
+            features = self._hash_dataframe(df)
+        elif features is None and self._can_vectorize_dataframe(df):
+            features = self._vectorize_dataframe(df)
         if features is None:
-            features = df.to_dict(orient='records')
+            feature_names = df.columns.tolist()
+            feature_columns = [df[name].tolist() for name in feature_names]
+            features = (dict(zip(feature_names, row))
+                        for row in zip(*feature_columns))
 
         return ids, labels, features
 
+    def _parse_dataframe_chunks(self, chunks, id_col, label_col):
+        """
+        Parse an iterator of data frames, e.g., as returned by
+        ``pd.read_csv()`` with a ``chunksize``, into ids, labels,
+        and features. Unlike ``_parse_dataframe()``, the features
+        of each chunk are vectorized before moving on to the next
+        one so that only one chunk is held in memory at a time.
+
+        Parameters
+        ----------
+        chunks : iterator of pd.DataFrame
+            The data frame chunks to parse.
+        id_col : str or None
+            The id column.
+        label_col : str or None
+            The label column.
+
+        Returns
+        -------
+        ids : np.array
+            The ids for the feature set.
+        labels : np.array
+            The labels for the feature set.
+        features : scipy.sparse.csr_matrix or np.array
+            The vectorized features for the feature set. If
+            a ``DictVectorizer`` is used, it is fitted as if
+            all of the features had been passed to it at once.
+        """
+        use_hasher = isinstance(self.vectorizer, FeatureHasher)
+        ids = []
+        labels = []
+        features = []
+        vocabulary = {}
+        num_examples = 0
+        text_columns = None
+        for df in chunks:
+            # each chunk infers its own column types, so make sure that
+            # no column is numeric in one chunk and text in another;
+            # otherwise the same value would become a different feature
+            # than it would if the whole file had been read at once
+            chunk_text_columns = {column: df[column].dtype == object
+                                  for column in df.columns}
+            if text_columns is None:
+                text_columns = chunk_text_columns
+            else:
+                mixed_columns = sorted(str(column) for column, is_text
+                                       in chunk_text_columns.items()
+                                       if is_text != text_columns.get(column,
+                                                                      is_text))
+                if mixed_columns:
+                    raise ValueError('The types of the following columns '
+                                     'differ between chunks starting at '
+                                     'example {}: {}. Specify their types '
+                                     'with "dtype" or do not use '
+                                     '"chunksize".'.format(num_examples + 1,
+                                                           ', '.join(mixed_columns)))
+            (chunk_ids,
+             chunk_labels,
+             chunk_features) = self._parse_dataframe(df, id_col, label_col,
+                                                     first_example_num=num_examples)
+            num_examples += len(chunk_ids)
+
+            if use_hasher:
+                if not sp.issparse(chunk_features):
+                    chunk_features = self.vectorizer.transform(chunk_features)
+            else:
+                # vectorize the chunk on its own, unless that was
+                # already done, and then map its columns onto the
+                # features seen so far
+                if sp.issparse(chunk_features):
+                    chunk_feature_names = self.vectorizer.feature_names_
+                else:
+                    chunk_vectorizer = DictVectorizer(dtype=self.vectorizer.dtype,
+                                                      separator=self.vectorizer.separator,
+                                                      sort=False)
+                    chunk_features = chunk_vectorizer.fit_transform(chunk_features)
+                    chunk_feature_names = chunk_vectorizer.feature_names_
+                column_map = np.array([vocabulary.setdefault(name,
+                                                             len(vocabulary))
+                                       for name in chunk_feature_names],
+                                      dtype=chunk_features.indices.dtype)
+                chunk_features.indices = column_map[chunk_features.indices]
+
+            ids.append(chunk_ids)
+            labels.append(chunk_labels)
+            features.append(chunk_features)
+
+        # make sure we raise the usual error for empty files
+        if not ids:
+            return self._parse_dataframe(pd.DataFrame(), None, None)
+
+        if not use_hasher:
+            features = [sp.csr_matrix((X.data, X.indices, X.indptr),
+                                      shape=(X.shape[0], len(vocabulary)))
+                        for X in features]
+        features = sp.vstack(features, format='csr')
+
+        if not use_hasher:
+            # sort the features by name, the way that
+            # the `DictVectorizer` would have done
+            feature_names = sorted(vocabulary) if self.vectorizer.sort \
+                else sorted(vocabulary, key=vocabulary.get)
+            new_columns = np.empty(len(vocabulary),
+                                   dtype=features.indices.dtype)
+            for new_column, name in enumerate(feature_names):
+                new_columns[vocabulary[name]] = new_column
+            features.indices = new_columns[features.indices]
+            features.has_sorted_indices = False
+            features.sort_indices()
+
+            self.vectorizer.feature_names_ = feature_names
+            self.vectorizer.vocabulary_ = {name: column for column, name
+                                           in enumerate(feature_names)}
+            if not self.vectorizer.sparse:
+                features = features.toarray()
+
+        return np.concatenate(ids), np.concatenate(labels), features
+
+    def _can_hash_dataframe(self, df):
+        """
+        Check whether the features in the given data frame can be
+        hashed directly by ``_hash_dataframe()``, i.e., whether we
+        are using a ``FeatureHasher`` that keeps the signs of the
+        hashed values and all of the feature columns are numeric.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            The data frame containing only the feature columns.
+
+        Returns
+        -------
+        can_hash : bool
+            Whether ``_hash_dataframe()`` can be used.
+        """
+        return (isinstance(self.vectorizer, FeatureHasher) and
+                not getattr(self.vectorizer, 'non_negative', False) and
+                df.shape[1] > 0 and
+                all(dtype.kind in 'iuf' for dtype in df.dtypes))
+
+    def _hash_dataframe(self, df):
+        """
+        Hash the numeric feature columns of a data frame directly into
+        a sparse matrix. This gives the same result as passing one
+        feature dictionary per row to the ``FeatureHasher``, but each
+        column name is only hashed once rather than once per row.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            The data frame containing only the (numeric) feature columns.
+
+        Returns
+        -------
+        features : scipy.sparse.csr_matrix
+            The hashed features.
+        """
+        num_rows, num_columns = df.shape
+
+        # let the hasher find the index and sign of each column
+        # so that we stay consistent with how it hashes names
+        hashed_columns = self.vectorizer.transform([{name: 1} for name
+                                                    in df.columns.tolist()])
+        column_indices = hashed_columns.indices
+        column_signs = hashed_columns.data
+
+        data = (df.values * column_signs).ravel()
+        indices = np.tile(column_indices, num_rows)
+        indptr = np.arange(0, num_rows * num_columns + 1, num_columns)
+        features = sp.csr_matrix((data, indices, indptr),
+                                 shape=(num_rows, self.vectorizer.n_features),
+                                 dtype=self.vectorizer.dtype)
+
+        # the hasher skips zero values and adds up the values of
+        # features that collide in the same row
+        features.eliminate_zeros()
+        features.sum_duplicates()
+        return features
+
+    def _can_vectorize_dataframe(self, df):
+        """
+        Check whether the features in the given data frame can be
+        vectorized column by column by ``_vectorize_dataframe()``,
+        i.e., whether we are using a ``DictVectorizer`` and some of
+        the feature columns are numeric. Unless all of them are, the
+        vectorizer also has to sort the feature names, since the order
+        in which it would first see the features of the other columns
+        is not known up front.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            The data frame containing only the feature columns.
+
+        Returns
+        -------
+        can_vectorize : bool
+            Whether ``_vectorize_dataframe()`` can be used.
+        """
+        if not isinstance(self.vectorizer, DictVectorizer) or df.shape[1] == 0:
+            return False
+        is_numeric = [dtype.kind in 'iuf' for dtype in df.dtypes]
+        return all(is_numeric) or (self.vectorizer.sort and any(is_numeric))
+
+    def _vectorize_dataframe(self, df):
+        """
+        Vectorize the feature columns of a data frame and fit the
+        ``DictVectorizer`` to the feature names. The numeric columns
+        are turned directly into a sparse matrix without building any
+        dictionaries for them; only the other columns are passed to
+        the vectorizer as dictionaries. This gives the same result as
+        passing one dictionary per row with all of the features.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            The data frame containing only the feature columns.
+
+        Returns
+        -------
+        features : scipy.sparse.csr_matrix or None
+            The vectorized features, or ``None`` if the names of
+            the features from the different columns clash and the
+            data frame has to be vectorized row by row instead.
+        """
+        num_rows = df.shape[0]
+        numeric_columns = []
+        other_columns = []
+        for name, dtype in zip(df.columns.tolist(), df.dtypes):
+            if dtype.kind in 'iuf':
+                numeric_columns.append(name)
+            else:
+                other_columns.append(name)
+        if self.vectorizer.sort and not other_columns:
+            numeric_columns = sorted(numeric_columns)
+
+        # every row has a value for every numeric column, which the
+        # vectorizer also stores when it is zero, so that part of the
+        # matrix is fully populated
+        num_columns = len(numeric_columns)
+        index_dtype = (np.int32 if num_rows * num_columns < np.iinfo(np.int32).max
+                       else np.int64)
+        data = df[numeric_columns].values.ravel()
+        indices = np.tile(np.arange(num_columns, dtype=index_dtype), num_rows)
+        indptr = np.arange(0, num_rows * num_columns + 1, num_columns,
+                           dtype=index_dtype)
+        features = sp.csr_matrix((data, indices, indptr),
+                                 shape=(num_rows, num_columns),
+                                 dtype=self.vectorizer.dtype)
+        feature_names = numeric_columns
+
+        if other_columns:
+            other_vectorizer = DictVectorizer(dtype=self.vectorizer.dtype,
+                                              separator=self.vectorizer.separator)
+            other_features = [df[name].tolist() for name in other_columns]
+            other_features = other_vectorizer.fit_transform(dict(zip(other_columns, row))
+                                                            for row in zip(*other_features))
+            feature_names = feature_names + other_vectorizer.feature_names_
+            if len(set(feature_names)) != len(feature_names):
+                return None
+
+            # put the columns of both parts in the order
+            # of the sorted names of their features
+            features = sp.hstack([features, other_features], format='csr')
+            sorted_names = sorted(feature_names)
+            new_columns = np.empty(len(feature_names),
+                                   dtype=features.indices.dtype)
+            vocabulary = {name: column for column, name
+                          in enumerate(feature_names)}
+            for new_column, name in enumerate(sorted_names):
+                new_columns[vocabulary[name]] = new_column
+            features.indices = new_columns[features.indices]
+            features.has_sorted_indices = False
+            features.sort_indices()
+            feature_names = sorted_names
+
+        self.vectorizer.feature_names_ = feature_names
+        self.vectorizer.vocabulary_ = {name: column for column, name
+                                       in enumerate(feature_names)}
+        return features
+
     def read(self):
         """
         Loads examples in the `.arff`, `.csv`, `.jsonlines`, `.libsvm`,
@@ -393,13 +856,21 @@ class Reader(object):
             print(self._progress_msg, end="\r", file=sys.stderr)
             sys.stderr.flush()
 
+        self._generated_ids = False
         if self._use_pandas:
             ids, labels, features = self._sub_read(self.path_or_list)
         else:
             ids, labels, features = self._sub_read_rows(self.path_or_list)
 
-        # Convert everything to numpy arrays
-        features = self.vectorizer.fit_transform(features)
+        # Convert everything to numpy arrays, unless
+        # the features have already been vectorized
+        if not (sp.issparse(features) or isinstance(features, np.ndarray)):
+            features = self.vectorizer.fit_transform(features)
+        # numeric data frames are vectorized straight into a sparse
+        # matrix, which may need to be made dense
+        elif (isinstance(self.vectorizer, DictVectorizer) and
+                not self.vectorizer.sparse and sp.issparse(features)):
+            features = features.toarray()
 
         # Report that loading is complete
         self._print_progress("done", end="\n")
@@ -407,7 +878,10 @@ class Reader(object):
         # Make sure we have the same number of ids, labels, and features
         assert ids.shape[0] == labels.shape[0] == features.shape[0]
 
-        if ids.shape[0] != len(set(ids)):
+        # check for duplicates using the hash table in `pandas`
+        # rather than building a Python set of all of the IDs,
+        # unless the IDs were all generated by the reader
+        if not self._generated_ids and pd.Index(ids).has_duplicates:
             raise ValueError('The example IDs are not unique in %s.' %
                              self.path_or_list)
 
@@ -487,7 +961,10 @@ class NDJReader(Reader):
         The path to a comma-delimited file.
     pandas_kwargs : dict or None, optional
         Arguments that will be passed directly
-        to the `pandas` I/O reader.
+        to the `pandas` I/O reader. If this is
+        not specified, the file is parsed line by
+        line (with `orjson`, if it is installed)
+        instead of with `pandas`.
         Defaults to None.
     kwargs : dict, optional
         Other arguments to the Reader object.
@@ -523,7 +1000,18 @@ class NDJReader(Reader):
         # create a data frame; if it's empty,
         # then return `_parse_dataframe()`, which
         # will raise an error
-        df = pd.read_json(path, orient='records', lines=True, **self._pandas_kwargs)
+        if self._pandas_kwargs:
+            df = pd.read_json(path, orient='records', lines=True,
+                              **self._pandas_kwargs)
+        else:
+            with open(path, 'rb') as f:
+                records = [json_loads(line) for line in f if line.strip()]
+            df = pd.DataFrame(records)
+            # convert the IDs and labels the same way `pd.read_json()`
+            # would have, so that e.g. labels like `3.0` are still ints
+            for column in ['id', 'y']:
+                if column in df:
+                    df[column] = _convert_json_column(df[column])
         if df.empty:
             return self._parse_dataframe(df, None, None)
 
@@ -549,12 +1037,16 @@ class MegaMReader(Reader):
     as a comment line directly preceding the line with feature values.
     """
 
-    def _sub_read(self, f):
+    def _sub_read(self, f, generate_ids=True):
         """
         Parameters
         ----------
-        f : file buffer
-            A file buffer for an MegaM file.
+        f : file buffer or iterable of str
+            A file buffer for an MegaM file, or its decoded lines.
+        generate_ids : bool, optional
+            Whether to generate IDs for examples without one. If
+            ``False``, ``None`` is yielded as the ID instead.
+            Defaults to ``True``.
 
         Yields
         ------
@@ -572,12 +1064,8 @@ class MegaMReader(Reader):
             If there are duplicate feature names.
         """
         example_num = 0
-        curr_id = 'EXAMPLE_0'
+        curr_id = 'EXAMPLE_0' if generate_ids else None
         for line in f:
-            # Process encoding
-            if not isinstance(line, text_type):
-                line = UnicodeDammit(line, ['utf-8',
-                                            'windows-1252']).unicode_markup
             line = line.strip()
             # Handle instance lines
             if line.startswith('#'):
@@ -603,15 +1091,13 @@ class MegaMReader(Reader):
 
                 curr_info_dict = {}
                 if len(field_pairs) > 0:
-                    # Get current instances feature-value pairs
-                    field_names = islice(field_pairs, 0, None, 2)
-                    # Convert values to floats, because otherwise
-                    # features'll be categorical
-                    field_values = (safe_float(val) for val in
-                                    islice(field_pairs, 1, None, 2))
-
-                    # Add the feature-value pairs to dictionary
-                    curr_info_dict.update(zip(field_names, field_values))
+                    # Build the dictionary in one go from the names
+                    # and the values; the values are converted to
+                    # floats, because otherwise features'll be
+                    # categorical
+                    curr_info_dict = dict(zip(field_pairs[::2],
+                                              map(safe_float,
+                                                  field_pairs[1::2])))
 
                     if len(curr_info_dict) != len(field_pairs) / 2:
                         raise ValueError(('There are duplicate feature ' +
@@ -624,7 +1110,8 @@ class MegaMReader(Reader):
                 # Set default example ID for next instance, in case we see a
                 # line without an ID.
                 example_num += 1
-                curr_id = 'EXAMPLE_{}'.format(example_num)
+                curr_id = ('EXAMPLE_{}'.format(example_num) if generate_ids
+                           else None)
 
 
 class LibSVMReader(Reader):
@@ -640,47 +1127,26 @@ class LibSVMReader(Reader):
         ExampleID | 1=FirstClass | 1=FirstFeature 2=SecondFeature
     """
 
-    line_regex = re.compile(r'^(?P<label_num>[^ ]+)\s+(?P<features>[^#]*)\s*'
-                            r'(?P<comments>#\s*(?P<example_id>[^|]+)\s*\|\s*'
-                            r'(?P<label_map>[^|]+)\s*\|\s*'
-                            r'(?P<feat_map>.*)\s*)?$', flags=re.UNICODE)
-
     LIBSVM_REPLACE_DICT = {'\u2236': ':',
                            '\uFF03': '#',
                            '\u2002': ' ',
                            '\ua78a': '=',
                            '\u2223': '|'}
 
-    @staticmethod
-    def _pair_to_tuple(pair, feat_map):
-        """
-        Split a feature-value pair separated by a colon into a tuple.  Also
-        do safe_float conversion on the value.
-
-        Parameters
-        ----------
-        feat_map : str
-            A feature-value pair to split.
-
-        Returns
-        -------
-        name : str
-            The name of the feature.
-        value
-            The value of the example.
-        """
-        name, value = pair.split(':')
-        if feat_map is not None:
-            name = feat_map[name]
-        value = safe_float(value)
-        return (name, value)
+    # translation table for undoing all of the above replacements at once
+    _LIBSVM_REPLACE_TABLE = {ord(orig): replacement for orig, replacement
+                             in LIBSVM_REPLACE_DICT.items()}
 
-    def _sub_read(self, f):
+    def _sub_read(self, f, generate_ids=True):
         """
         Parameters
         ----------
-        f : file buffer
-            A file buffer for an LibSVM file.
+        f : file buffer or iterable of str
+            A file buffer for an LibSVM file, or its decoded lines.
+        generate_ids : bool, optional
+            Whether to generate IDs for examples without one. If
+            ``False``, ``None`` is yielded as the ID instead.
+            Defaults to ``True``.
 
         Yields
         ------
@@ -699,39 +1165,44 @@ class LibSVMReader(Reader):
         """
         for example_num, line in enumerate(f):
             curr_id = ''
-            # Decode line if it's not already str
-            if isinstance(line, bytes):
-                line = UnicodeDammit(line, ['utf-8',
-                                            'windows-1252']).unicode_markup
-            match = self.line_regex.search(line.strip())
-            if not match:
+            line = line.strip()
+
+            # Split the line into the label and feature-value pairs
+            # and the optional comment, which must be of the form
+            # "ExampleID | label map | feature map"
+            data, comment_sep, comments = line.partition('#')
+            fields = data.split(None, 1)
+            if comment_sep:
+                comment_fields = comments.split('|', 2)
+            if (not fields or (len(fields) == 1 and not comment_sep) or
+                    (comment_sep and (len(comment_fields) < 3 or
+                                      not comment_fields[0] or
+                                      not comment_fields[1]))):
                 raise ValueError('Line does not look like valid libsvm format'
                                  '\n{}'.format(line))
+
+            feat_map = None
+            label_map = None
             # Metadata is stored in comments if this was produced by SKLL
-            if match.group('comments') is not None:
+            if comment_sep:
+                example_id, label_map_str, feat_map_str = comment_fields
                 # Store mapping from feature numbers to names
-                if match.group('feat_map'):
+                feat_map_pairs = feat_map_str.split()
+                if feat_map_pairs:
                     feat_map = {}
-                    for pair in match.group('feat_map').split():
+                    for pair in feat_map_pairs:
                         number, name = pair.split('=')
-                        for orig, replacement in \
-                                LibSVMReader.LIBSVM_REPLACE_DICT.items():
-                            name = name.replace(orig, replacement)
-                        feat_map[number] = name
-                else:
-                    feat_map = None
+                        feat_map[number] = name.translate(self._LIBSVM_REPLACE_TABLE)
                 # Store mapping from label/class numbers to names
-                if match.group('label_map'):
-                    label_map = dict(pair.split('=') for pair in
-                                     match.group('label_map').strip().split())
-                else:
-                    label_map = None
-                curr_id = match.group('example_id').strip()
+                label_map = dict(pair.split('=') for pair in
+                                 label_map_str.split())
+                curr_id = example_id.strip()
 
             if not curr_id:
-                curr_id = 'EXAMPLE_{}'.format(example_num)
+                curr_id = ('EXAMPLE_{}'.format(example_num) if generate_ids
+                           else None)
 
-            class_num = match.group('label_num')
+            class_num = fields[0]
             # If we have a mapping from class numbers to labels, get label
             if label_map:
                 class_name = label_map[class_num]
@@ -740,8 +1211,17 @@ class LibSVMReader(Reader):
             class_name = safe_float(class_name,
                                     replace_dict=self.class_map)
 
-            curr_info_dict = dict(self._pair_to_tuple(pair, feat_map) for pair
-                                  in match.group('features').strip().split())
+            # split all of the feature-value pairs in one go and
+            # then convert the values to floats and map the feature
+            # numbers to names, if we have a mapping
+            feature_pairs = (fields[1].split() if len(fields) > 1 else [])
+            raw_info_dict = dict(pair.split(':') for pair in feature_pairs)
+            if feat_map is None:
+                curr_info_dict = {name: safe_float(value) for name, value
+                                  in raw_info_dict.items()}
+            else:
+                curr_info_dict = {feat_map[name]: safe_float(value) for
+                                  name, value in raw_info_dict.items()}
 
             yield curr_id, class_name, curr_info_dict
 
@@ -763,10 +1243,26 @@ class CSVReader(Reader):
         The path to a comma-delimited file.
     pandas_kwargs : dict or None, optional
         Arguments that will be passed directly
-        to the `pandas` I/O reader.
+        to the `pandas` I/O reader. If ``chunksize``
+        is specified, the file is read and vectorized
+        that many rows at a time, which reduces the
+        memory needed for large files; a column must then
+        have the same inferred type in every chunk. If ``engine`` is
+        set to ``'pyarrow'``, the file is instead parsed
+        with the multi-threaded `pyarrow` CSV reader,
+        which only supports ``sep``. This requires
+        `pyarrow` 2.0 or newer, and older than 12.0
+        with `pandas` versions before 1.0.
         Defaults to None.
     kwargs : dict, optional
         Other arguments to the Reader object.
+
+    Raises
+    ------
+    ValueError
+        If ``engine`` is ``'pyarrow'`` but a supported version of
+        `pyarrow` is not installed or other arguments besides ``sep``
+        are specified.
     """
 
     def __init__(self, path_or_list, pandas_kwargs=None, **kwargs):
@@ -774,6 +1270,27 @@ class CSVReader(Reader):
         self._pandas_kwargs = {} if pandas_kwargs is None else pandas_kwargs
         self._sep = self._pandas_kwargs.pop('sep', str(','))
         self._engine = self._pandas_kwargs.pop('engine', 'c')
+        self._chunksize = self._pandas_kwargs.pop('chunksize', None)
+        if self._engine == 'pyarrow' and _PYARROW_VERSION is None:
+            raise ValueError('The "pyarrow" engine was requested for '
+                             'reading {}, but pyarrow is not '
+                             'installed.'.format(path_or_list))
+        if self._engine == 'pyarrow' and not _HAVE_PYARROW:
+            raise ValueError('The "pyarrow" engine was requested for '
+                             'reading {}, but pyarrow {} is not supported '
+                             'with pandas {}. Use pyarrow 2.0 or newer, and '
+                             'older than 12.0 with pandas versions before '
+                             '1.0.'.format(path_or_list, _PYARROW_VERSION,
+                                           pd.__version__))
+        if self._engine == 'pyarrow' and (self._chunksize is not None or
+                                          self._pandas_kwargs):
+            unsupported = sorted(self._pandas_kwargs)
+            if self._chunksize is not None:
+                unsupported = sorted(unsupported + ['chunksize'])
+            raise ValueError('The "pyarrow" engine only supports the "sep" '
+                             'argument, but the following arguments were '
+                             'also specified for reading {}: '
+                             '{}.'.format(path_or_list, ', '.join(unsupported)))
         self._use_pandas = True
 
     def _sub_read(self, path):
@@ -792,7 +1309,18 @@ class CSVReader(Reader):
         features : list of dicts
             The features for the features set.
         """
-        df = pd.read_csv(path, sep=self._sep, engine=self._engine, **self._pandas_kwargs)
+        if self._engine == 'pyarrow':
+            parse_options = pa_csv.ParseOptions(delimiter=self._sep)
+            table = pa_csv.read_csv(path, parse_options=parse_options)
+            # let pandas reuse the Arrow buffers instead of copying them
+            df = table.to_pandas(split_blocks=True, self_destruct=True)
+            del table
+        elif self._chunksize is not None:
+            chunks = pd.read_csv(path, sep=self._sep, engine=self._engine,
+                                 chunksize=self._chunksize, **self._pandas_kwargs)
+            return self._parse_dataframe_chunks(chunks, self.id_col, self.label_col)
+        else:
+            df = pd.read_csv(path, sep=self._sep, engine=self._engine, **self._pandas_kwargs)
         return self._parse_dataframe(df, self.id_col, self.label_col)
 
 
@@ -813,10 +1341,26 @@ class TSVReader(CSVReader):
         The path to a comma-delimited file.
     pandas_kwargs : dict or None, optional
         Arguments that will be passed directly
-        to the `pandas` I/O reader.
+        to the `pandas` I/O reader. If ``chunksize``
+        is specified, the file is read and vectorized
+        that many rows at a time, which reduces the
+        memory needed for large files; a column must then
+        have the same inferred type in every chunk. If ``engine`` is
+        set to ``'pyarrow'``, the file is instead parsed
+        with the multi-threaded `pyarrow` CSV reader,
+        which only supports ``sep``. This requires
+        `pyarrow` 2.0 or newer, and older than 12.0
+        with `pandas` versions before 1.0.
         Defaults to None.
     kwargs : dict, optional
         Other arguments to the Reader object.
+
+    Raises
+    ------
+    ValueError
+        If ``engine`` is ``'pyarrow'`` but a supported version of
+        `pyarrow` is not installed or other arguments besides ``sep``
+        are specified.
     """
 
     def __init__(self, path_or_list, pandas_kwargs=None, **kwargs):
@@ -866,15 +1410,17 @@ class ARFFReader(Reader):
                           delimiter=' ',
                           header=None,
                           quote_char="'",
-                          escape_char='\\'):
+                          escape_char='\\',
+                          dtype=None):
         """
         A replacement for string.split that won't split delimiters enclosed in
         quotes.
 
         Parameters
         ----------
-        s : str
-            The string with quotes to split
+        s : str or file buffer
+            The string with quotes to split, or a file
+            buffer positioned at the text to split.
         header : list or None, optional
             The names of the header columns
             or None.
@@ -888,21 +1434,26 @@ class ARFFReader(Reader):
         escape_char : str, optional
             The escape character.
             Defaults to ``'\\'``.
+        dtype : dict or None, optional
+            A mapping from column numbers to the types of those
+            columns, for the columns whose types should not be
+            inferred by ``pd.read_csv()``.
+            Defaults to ``None``.
         """
-        if PY2:
-            delimiter = delimiter.encode()
-            quote_char = quote_char.encode()
-            escape_char = escape_char.encode()
-
         # additional arguments we want
-        # to pass to the `pd.read_csv()` function
+        # to pass to the `pd.read_csv()` function;
+        # the characters have to be native strings
         kwargs = {'header': header,
-                  'delimiter': delimiter,
-                  'quotechar': quote_char,
-                  'escapechar': escape_char}
+                  'delimiter': str(delimiter),
+                  'quotechar': str(quote_char),
+                  'escapechar': str(escape_char)}
+        if dtype is not None:
+            kwargs['dtype'] = dtype
         kwargs.update(self._pandas_kwargs)
 
-        df = pd.read_csv(StringIO(s), engine=self._engine, **kwargs)
+        if isinstance(s, string_types):
+            s = StringIO(s)
+        df = pd.read_csv(s, engine=self._engine, **kwargs)
         return df
 
     def _sub_read(self, path):
@@ -921,42 +1472,427 @@ class ARFFReader(Reader):
         features : list of dicts
             The features for the features set.
         """
-        with open(path, 'r' if PY3 else 'rb') as buff:
+        # find the row that starts the data using a memory map, so
+        # that the rows before it are the only ones we have to read
+        # ourselves; the data is then parsed by `pandas` straight
+        # from the file rather than from a copy of its lines
+        data_section = _find_arff_data_section(path)
+        if data_section is None:
+            raise ValueError("No @data section found in ARFF file "
+                             "'{}'.".format(path))
+        header_end, data_start = data_section
+
+        encoding = _detect_encoding(path)
+        with open(path, 'rb') as f:
+            header = f.read(header_end).decode(encoding, 'replace')
+            # the header is split and stripped in bulk
+            # rather than by reading it line by line
+            header_lines = [line for line in
+                            map(text_type.strip, header.splitlines())
+                            if line]
+
+            # get the column names from the attribute
+            # rows, and add them to the columns list;
+            # the header rows are split without using
+            # `split_with_quotes()` to avoid running
+            # the `pandas` parser for every row
+            columns = []
+            nominal_columns = []
+            numeric_dtypes = {}
+            for row in map(_split_arff_header_line, header_lines):
+                if not row:
+                    continue
+
+                keyword = row[0].lower()
+                if keyword == '@attribute':
+                    column = row[1]
+                    column_type = row[2].lower() if len(row) > 2 else ''
+                    # keep track of the nominal attributes,
+                    # whose types list their possible values,
+                    # except for the IDs, which must stay an array
+                    if column_type.startswith('{'):
+                        if column != self.id_col:
+                            nominal_columns.append(len(columns))
+                    # numeric features are read as floats straight
+                    # away, so `pandas` does not have to infer their
+                    # types; the IDs and labels are still inferred
+                    # so that integer ones are kept as they are
+                    elif (column_type in _ARFF_NUMERIC_TYPES and
+                            column not in (self.id_col, self.label_col)):
+                        numeric_dtypes[len(columns)] = np.float64
+                    columns.append(column)
+
+                    # if the column is the label column,
+                    # and the type is 'numeric', set regression
+                    # to True; otherwise False
+                    if column == self.label_col:
+                        self.regression = column_type == 'numeric'
+
+                # if the relation attribute exists, then
+                # add it to the relation instance variable
+                elif keyword == '@relation':
+                    self.relation = row[1]
+
+            # the data lines are stripped as `pandas` reads them,
+            # since leading and trailing whitespace is not part
+            # of the values and would otherwise hide their quotes
+            f.seek(data_start)
+            buff = TextIOWrapper(f, encoding=encoding, errors='replace')
+            try:
+                df = self.split_with_quotes(_StrippedLines(buff),
+                                            delimiter=',',
+                                            dtype=numeric_dtypes or None)
+            except ValueError:
+                # some of the numeric features have values that are
+                # not numbers, such as missing values, so read the
+                # data again and let `pandas` infer the types instead
+                buff.detach()
+                f.seek(data_start)
+                buff = TextIOWrapper(f, encoding=encoding, errors='replace')
+                df = self.split_with_quotes(_StrippedLines(buff),
+                                            delimiter=',')
+
+        # nominal attributes only have a few distinct values, so
+        # store any string ones as categoricals rather than objects
+        for column_num in nominal_columns:
+            if column_num in df and df[column_num].dtype == object:
+                df[column_num] = df[column_num].astype('category')
 
-            lines = [UnicodeDammit(line.strip(), ['utf-8', 'windows-1252']).unicode_markup
-                     if not isinstance(line, text_type) and PY2
-                     else line.strip()
-                     for line in buff if line.strip()]
+        df.columns = columns
+        return self._parse_dataframe(df, self.id_col, self.label_col)
 
-        # find the row index starting with data; the line below this
-        # is where the data should actually begin
-        data_idx = lines.index('@data')
 
-        df = self.split_with_quotes('\n'.join(lines[data_idx + 1:]), delimiter=',')
+class _StrippedLines(object):
+    """
+    A read-only file-like object over the given lines that strips each
+    of them and skips the blank ones, so that ``pd.read_csv()`` can
+    parse them without them being joined into one string first.
 
-        # get the column names from the attribute
-        # rows, and add them to the columns list
-        columns = []
-        for row in lines[:data_idx]:
+    Parameters
+    ----------
+    lines : iterable of str
+        The lines to strip, e.g., an open text file.
+    """
 
-            row_series = self.split_with_quotes(row)
-            if row_series.loc[0, 0] == '@attribute':
-                column = row_series.loc[0, 1]
-                columns.append(column)
+    def __init__(self, lines):
+        self._lines = (line for line in map(text_type.strip, lines) if line)
+        self._buffer = ''
 
-                # if the column is the label column,
-                # and the type is 'numeric', set regression
-                # to True; otherwise False
-                if column == self.label_col:
-                    self.regression = row_series.loc[0, 2] == 'numeric'
+    def __iter__(self):
+        return self
 
-            # if the relation attribute exists, then
-            # add it to the relation instance variable
-            elif row_series.loc[0, 0] == '@relation':
-                self.relation = row_series.loc[0, 1]
+    def __next__(self):
+        line = self.readline()
+        if not line:
+            raise StopIteration
+        return line
+
+    next = __next__
+
+    def readline(self):
+        """
+        Read the next stripped line, or an empty string at the end.
+        """
+        if not self._buffer:
+            for line in self._lines:
+                self._buffer = line + '\n'
+                break
+            else:
+                return ''
+        line_end = self._buffer.find('\n') + 1
+        line = self._buffer[:line_end]
+        self._buffer = self._buffer[line_end:]
+        return line
+
+    def read(self, size=-1):
+        """
+        Read at least ``size`` characters, or all of the remaining
+        ones if ``size`` is negative or ``None``.
+        """
+        chunks = [self._buffer]
+        length = len(self._buffer)
+        for line in self._lines:
+            chunks.append(line)
+            chunks.append('\n')
+            length += len(line) + 1
+            if size is not None and 0 <= size <= length:
+                break
+        data = ''.join(chunks)
+        if size is None or size < 0:
+            self._buffer = ''
+            return data
+        self._buffer = data[size:]
+        return data[:size]
+
+
+def _iter_mmap_lines(path, start=0, end=None):
+    """
+    Memory-map the file at the given path and iterate over its
+    lines, decoding each one exactly once. This avoids the extra
+    buffering done by regular file objects when reading large files.
+
+    Parameters
+    ----------
+    path : str
+        The path to the file.
+    start : int, optional
+        The byte offset of the first line to read.
+        Defaults to 0.
+    end : int, optional
+        The byte offset at which to stop reading. Should be
+        the start of a line. If ``None``, read to the end.
+        Defaults to ``None``.
+
+    Yields
+    ------
+    line : str
+        The next decoded line in the file.
+    """
+    with open(path, 'rb') as f:
+        # empty files cannot be memory-mapped
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            mm.seek(start)
+            if end is None:
+                for line in iter(mm.readline, b''):
+                    yield _decode_line(line)
+            else:
+                while mm.tell() < end:
+                    yield _decode_line(mm.readline())
+        finally:
+            mm.close()
+
+
+def _chunk_line_ranges(path, num_chunks):
+    """
+    Split the file at the given path into at most ``num_chunks``
+    byte ranges of roughly equal size that only contain whole lines.
+    A range never ends with a blank line or a comment, so that a MegaM
+    example always stays together with the line holding its ID.
+
+    Parameters
+    ----------
+    path : str
+        The path to the file.
+    num_chunks : int
+        The number of ranges to split the file into.
+
+    Returns
+    -------
+    ranges : list of tuples
+        The start and end byte offsets of each range.
+    """
+    size = os.path.getsize(path)
+    if size == 0:
+        return [(0, 0)]
+    with open(path, 'rb') as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            boundaries = [0]
+            for chunk_num in range(1, num_chunks):
+                pos = max(size * chunk_num // num_chunks, boundaries[-1])
+                newline_pos = mm.find(b'\n', pos)
+                while newline_pos != -1:
+                    line_start = mm.rfind(b'\n', 0, newline_pos) + 1
+                    line = mm[line_start:newline_pos].strip()
+                    if line and not line.startswith(b'#'):
+                        break
+                    newline_pos = mm.find(b'\n', newline_pos + 1)
+                if newline_pos == -1 or newline_pos + 1 >= size:
+                    break
+                if newline_pos + 1 > boundaries[-1]:
+                    boundaries.append(newline_pos + 1)
+            boundaries.append(size)
+        finally:
+            mm.close()
+    return list(zip(boundaries[:-1], boundaries[1:]))
+
+
+def _read_rows_chunk(reader, path, start, end):
+    """
+    Parse the lines in the given byte range of a file with the
+    row-based reader. This is run in a separate process by
+    ``Reader._iter_rows()`` when reading in parallel.
+
+    Parameters
+    ----------
+    reader : skll.Reader
+        The row-based reader to parse the lines with.
+    path : str
+        The path to the file.
+    start : int
+        The byte offset of the first line to parse.
+    end : int
+        The byte offset at which to stop parsing.
+
+    Returns
+    -------
+    rows : list of tuples
+        The ID, label, and features of each example in the range,
+        where the ID is ``None`` if it has to be generated.
+    """
+    with closing(_iter_mmap_lines(path, start, end)) as lines:
+        return list(reader._sub_read(lines, generate_ids=False))
+
+
+def _split_arff_header_line(line):
+    """
+    Split a line from the header of an ARFF file on spaces, without
+    splitting names that are enclosed in quotes. Single quotes are
+    handled by the ``csv`` module. Lines with double quotes, which
+    Weka also allows, are split with ``shlex`` instead, which is
+    slower but understands both kinds of quotes.
+
+    Parameters
+    ----------
+    line : str
+        The header line to split.
+
+    Returns
+    -------
+    tokens : list of str
+        The tokens in the line.
+    """
+    if PY2:
+        line = line.encode('utf-8')
+
+    if '"' in line:
+        lexer = shlex.shlex(line, posix=True)
+        lexer.whitespace_split = True
+        lexer.commenters = str('')
+        lexer.quotes = str('\'"')
+        lexer.escapedquotes = str('\'"')
+        tokens = list(lexer)
+    else:
+        tokens = next(csv.reader([line],
+                                 delimiter=str(' '),
+                                 quotechar=str("'"),
+                                 escapechar=str('\\'),
+                                 skipinitialspace=True), [])
+
+    if PY2:
+        tokens = [token.decode('utf-8') for token in tokens]
+    return tokens
+
+
+def _convert_json_column(series):
+    """
+    Convert a column of values parsed from JSON in the same way that
+    ``pd.read_json()`` converts the columns it reads: values that are
+    strings of numbers become floats, and floats that are all whole
+    numbers become ints.
+
+    Parameters
+    ----------
+    series : pd.Series
+        The column to convert.
+
+    Returns
+    -------
+    series : pd.Series
+        The converted column.
+    """
+    if series.dtype == object:
+        try:
+            series = series.astype(np.float64)
+        except (TypeError, ValueError):
+            pass
+
+    if series.dtype.kind == 'f' and series.dtype != np.float64:
+        series = series.astype(np.float64)
+
+    if len(series) and (series.dtype == np.float64 or series.dtype == object):
+        try:
+            int_series = series.astype(np.int64)
+        except (TypeError, ValueError, OverflowError):
+            pass
+        else:
+            if (int_series == series).all():
+                series = int_series
+
+    return series
+
+
+def _find_arff_data_section(path):
+    """
+    Find the ``@data`` row of an ARFF file by searching a memory map of
+    the file, so that none of the rows have to be read to find it.
+
+    Parameters
+    ----------
+    path : str
+        The path to the ARFF file.
+
+    Returns
+    -------
+    offsets : tuple of int or None
+        The byte offsets of the start of the ``@data`` row and of the
+        row after it, or ``None`` if the file has no ``@data`` row.
+    """
+    with open(path, 'rb') as f:
+        # empty files cannot be memory-mapped
+        if os.fstat(f.fileno()).st_size == 0:
+            return None
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            match = _ARFF_DATA_RE.search(mm)
+        finally:
+            mm.close()
+    return None if match is None else match.span()
+
+
+def _detect_encoding(path, sample_size=65536):
+    """
+    Detect the encoding of a file from its first bytes. The file is
+    assumed to be UTF-8 if those are valid UTF-8; otherwise, the
+    encoding is left to ``UnicodeDammit`` to decide on.
+
+    Parameters
+    ----------
+    path : str
+        The path to the file.
+    sample_size : int, optional
+        The number of bytes to look at.
+        Defaults to 65536.
+
+    Returns
+    -------
+    encoding : str
+        The name of the encoding of the file.
+    """
+    with open(path, 'rb') as f:
+        sample = f.read(sample_size)
+    try:
+        # the sample may end in the middle of a character,
+        # which the incremental decoder does not mind
+        codecs.getincrementaldecoder('utf-8')().decode(sample)
+    except UnicodeDecodeError:
+        dammit = UnicodeDammit(sample, ['utf-8', 'windows-1252'])
+        return dammit.original_encoding or 'windows-1252'
+    return 'utf-8'
 
-        df.columns = columns
-        return self._parse_dataframe(df, self.id_col, self.label_col)
+
+def _decode_line(line):
+    """
+    Decode a line of bytes as UTF-8, falling back to Windows-1252
+    if it is not valid UTF-8.
+
+    Parameters
+    ----------
+    line : bytes
+        The line to decode.
+
+    Returns
+    -------
+    line : str
+        The decoded line.
+    """
+    try:
+        return line.decode('utf-8')
+    except UnicodeDecodeError:
+        return line.decode('windows-1252', 'replace')
 
 
 def safe_float(text, replace_dict=None, logger=None):
@@ -986,12 +1922,20 @@ def safe_float(text, replace_dict=None, logger=None):
         The text value converted to int or float, if possible
     """
 
-    # convert to text to be "Safe"!
-    text = text_type(text)
+    # values that are numbers already, like the ones in columns
+    # that `pandas` has inferred to be numeric, need no conversion
+    # unless they have to be looked up in the replacement mapping
+    if replace_dict is None and type(text) in _NUMERIC_TYPES:
+        return text
+
+    # convert to text to be "Safe"! but skip the call if it
+    # is text already, which it usually is; sub-classes like
+    # `np.str_` are still converted to plain text
+    if type(text) is not text_type:
+        text = text_type(text)
 
-    # get a logger unless we are passed one
-    if not logger:
-        logger = logging.getLogger(__name__)
+    # use the module logger unless we are passed one
+    logger = logger or _MODULE_LOGGER
 
     if replace_dict is not None:
         if text in replace_dict:
@@ -999,6 +1943,27 @@ def safe_float(text, replace_dict=None, logger=None):
         else:
             logger.warning('Encountered value that was not in replacement '
                            'dictionary (e.g., class_map): {}'.format(text))
+
+    # raising exceptions is expensive, so only try to convert
+    # to an int if the text actually looks like an integer and
+    # skip the conversion to a float entirely if the text either
+    # clearly is a float or clearly is not a number at all
+    if isinstance(text, text_type):
+        digits = text.strip()
+        if digits[:1] in ('-', '+'):
+            digits = digits[1:]
+        if digits.isdigit():
+            pass
+        elif _FLOAT_RE.match(digits):
+            return float(text)
+        elif (not _DIGIT_RE.search(digits) and
+                digits.lower() not in _NON_FINITE_FLOATS):
+            return text.decode('utf-8') if PY2 else text
+        else:
+            try:
+                return float(text)
+            except ValueError:
+                return text.decode('utf-8') if PY2 else text
     try:
         return int(text)
     except ValueError:
@@ -1012,6 +1977,49 @@ def safe_float(text, replace_dict=None, logger=None):
         return 0
 
 
+def safe_float_series(series, replace_dict=None, logger=None):
+    """
+    Apply ``safe_float()`` to all of the values in a series. There
+    are usually far fewer distinct values than rows in a column of
+    labels, so each distinct value is only converted once and the
+    results are mapped back onto the whole column.
+
+    Parameters
+    ----------
+    series : pd.Series
+        The values to convert.
+    replace_dict : dict, optional
+        Mapping from text to replacement text values, which is
+        passed on to ``safe_float()``.
+        Defaults to ``None``.
+    logger : logging.Logger
+        The Logger instance to use to log messages. Used instead of
+        creating a new Logger instance by default.
+        Defaults to ``None``.
+
+    Returns
+    -------
+    series : pd.Series
+        The converted values.
+    """
+    # the values of categorical series are already unique,
+    # so convert them and then pick the results by their codes
+    if pd.api.types.is_categorical_dtype(series.dtype):
+        codes = series.cat.codes.values
+        if (codes >= 0).all():
+            converted = pd.Series([safe_float(value,
+                                              replace_dict=replace_dict,
+                                              logger=logger)
+                                   for value in series.cat.categories])
+            return pd.Series(converted.values.take(codes), index=series.index)
+        series = series.astype(object)
+
+    unique_values = series.unique()
+    converted = [safe_float(value, replace_dict=replace_dict, logger=logger)
+                 for value in unique_values]
+    return series.map(pd.Series(converted, index=unique_values))
+
+
 # Constants
 EXT_TO_READER = {".arff": ARFFReader,
                  ".csv": CSVReader,
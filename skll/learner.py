@@ -832,6 +832,11 @@ class Learner(object):
     logger : logging object, optional
         A logging object. If ``None`` is passed, get logger from ``__name__``.
         Defaults to ``None``.
+
+    Raises
+    ------
+    ValueError
+        If a sampler is used with MultinomialNB.
     """
 
     def __init__(self, model_type, probability=False, pipeline=False,
@@ -933,6 +938,10 @@ class Learner(object):
         if sampler_kwargs:
             self._sampler_kwargs.update(sampler_kwargs)
         if sampler:
+            if issubclass(self._model_type, MultinomialNB):
+                raise ValueError('Cannot use a sampler with MultinomialNB '
+                                 'because MultinomialNB cannot handle '
+                                 'negative feature values.')
             sampler_type = globals()[sampler]
             if issubclass(sampler_type, (Nystroem, RBFSampler,
                                          SkewedChi2Sampler)):
@@ -1469,6 +1478,13 @@ class Learner(object):
             If FeatureHasher is used with MultinomialNB.
         """
 
+        # check this before doing any of the work below
+        if isinstance(examples.vectorizer, FeatureHasher) and \
+                issubclass(self._model_type, MultinomialNB):
+            raise ValueError('Cannot use FeatureHasher with MultinomialNB '
+                             'because MultinomialNB cannot handle negative '
+                             'feature values.')
+
         # if we are asked to do grid search, check that the grid objective
         # is specified and that the specified function is valid for the
         # selected learner
@@ -1560,12 +1576,6 @@ class Learner(object):
                                   'data to dense. This was required because ' +
                                   reason)
 
-        if isinstance(self.feat_vectorizer, FeatureHasher) and \
-                issubclass(self._model_type, MultinomialNB):
-            raise ValueError('Cannot use FeatureHasher with MultinomialNB '
-                             'because MultinomialNB cannot handle negative '
-                             'feature values.')
-
         # Scale features if necessary
         if not issubclass(self._model_type, MultinomialNB):
             xtrain = self.scaler.fit_transform(xtrain)
@@ -1574,12 +1584,6 @@ class Learner(object):
         self._check_max_feature_value(xtrain)
 
         # Sampler
-        if self.sampler is not None and \
-                issubclass(self._model_type, MultinomialNB):
-            raise ValueError('Cannot use a sampler with MultinomialNB '
-                             'because MultinomialNB cannot handle negative '
-                             'feature values.')
-
         if self.sampler:
             self.logger.warning('Sampler converts sparse matrix to dense')
             if isinstance(self.sampler, SkewedChi2Sampler):
@@ -41,17 +41,22 @@ def get_skll_logger(name, filepath=None, log_level=logging.INFO):
     logger = logging.getLogger(name)
 
     # if we are given a file path and this existing logger doesn't already
-    # have a file handler for this file, then add one.
+    # have a file handler for this file, then add one; the handlers we
+    # added are recorded on the logger by file path so that we do not
+    # have to look at the streams of all of its handlers every time
     if filepath:
-        is_file_handler = lambda handler: isinstance(handler, FileHandler) \
-                                                and handler.stream.name == filepath
-        need_file_handler = not any([is_file_handler(handler) for handler in logger.handlers])
+        if not hasattr(logger, '_skll_file_handlers'):
+            logger._skll_file_handlers = {}
+        file_handler = logger._skll_file_handlers.get(filepath)
+        need_file_handler = (file_handler is None or
+                             file_handler not in logger.handlers)
         if need_file_handler:
             formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-            file_handler = logging.FileHandler(filepath, mode='w')
+            file_handler = FileHandler(filepath, mode='w')
             file_handler.setFormatter(formatter)
             file_handler.setLevel(log_level)
             logger.addHandler(file_handler)
+            logger._skll_file_handlers[filepath] = file_handler
 
     # return the logger instance
     return logger
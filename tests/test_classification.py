@@ -12,11 +12,10 @@ from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 
 import csv
-import glob
+import errno
 import itertools
 import json
 import os
-import re
 import sys
 import warnings
 
@@ -24,12 +23,14 @@ from io import open
 from os.path import abspath, dirname, exists, join
 
 import numpy as np
+import scipy.sparse as sp
 from nose.tools import eq_, assert_almost_equal, raises
 
 from sklearn.exceptions import ConvergenceWarning
 from sklearn.metrics import accuracy_score
 
 from skll.data import FeatureSet
+from skll.data.dict_vectorizer import DictVectorizer
 from skll.data.readers import NDJReader
 from skll.data.writers import NDJWriter
 from skll.config import _parse_config_file
@@ -41,9 +42,19 @@ from utils import (make_classification_data, make_regression_data,
                    make_sparse_data, fill_in_config_paths_for_single_file)
 
 
+# Use orjson to parse the result files if it is available
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
 _ALL_MODELS = list(_DEFAULT_PARAM_GRIDS.keys())
 _my_dir = abspath(dirname(__file__))
 
+# the featuresets created by `_cached_data()`, keyed
+# on the function and the arguments used to create them
+_DATA_CACHE = {}
+
 
 def setup():
     train_dir = join(_my_dir, 'train')
@@ -63,26 +74,37 @@ def tearDown():
     output_dir = join(_my_dir, 'output')
     config_dir = join(_my_dir, 'configs')
 
-    if exists(join(train_dir, 'train_single_file.jsonlines')):
-        os.unlink(join(train_dir, 'train_single_file.jsonlines'))
-
-    if exists(join(test_dir, 'test_single_file.jsonlines')):
-        os.unlink(join(test_dir, 'test_single_file.jsonlines'))
-
-    if exists(join(output_dir, 'rare_class_predictions.tsv')):
-        os.unlink(join(output_dir, 'rare_class_predictions.tsv'))
-
-    if exists(join(output_dir, 'float_class_predictions.tsv')):
-        os.unlink(join(output_dir, 'float_class_predictions.tsv'))
-
-    for output_file in glob.glob(join(output_dir, 'train_test_single_file_*')):
-        os.unlink(output_file)
-
-    config_files = [join(config_dir, cfgname) for cfgname in ['test_single_file.cfg',
-                                                              'test_single_file_saved_subset']]
-    for config_file in config_files:
-        if exists(config_file):
-            os.unlink(config_file)
+    # remove the files without checking whether they exist first
+    # and ignore the errors for any that do not
+    paths = [join(train_dir, 'train_single_file.jsonlines'),
+             join(test_dir, 'test_single_file.jsonlines'),
+             join(test_dir, 'test_single_file_subset.jsonlines'),
+             join(output_dir, 'rare_class_predictions.tsv'),
+             join(output_dir, 'float_class_predictions.tsv'),
+             join(config_dir, 'test_single_file.cfg'),
+             join(config_dir, 'test_single_file_saved_subset.cfg')]
+    paths.extend(join(output_dir, filename) for filename in
+                 os.listdir(output_dir) if
+                 filename.startswith('train_test_single_file_'))
+    for path in paths:
+        try:
+            os.unlink(path)
+        except OSError as e:
+            if e.errno != errno.ENOENT:
+                raise
+
+
+def _cached_data(make_data, **kwargs):
+    """
+    Create the data with the given function and arguments only the first
+    time it is asked for and return the same featuresets after that. The
+    learners do not modify the featuresets they are trained and evaluated
+    on, so the many tests that use the same data can safely share them.
+    """
+    key = (make_data, frozenset(kwargs.items()))
+    if key not in _DATA_CACHE:
+        _DATA_CACHE[key] = make_data(**kwargs)
+    return _DATA_CACHE[key]
 
 
 def check_predict(model, use_feature_hashing=False):
@@ -96,18 +118,21 @@ def check_predict(model, use_feature_hashing=False):
     # create the random data for the given model
     if model._estimator_type == 'regressor':
         train_fs, test_fs, _ = \
-            make_regression_data(use_feature_hashing=use_feature_hashing,
-                                 feature_bins=5)
+            _cached_data(make_regression_data,
+                         use_feature_hashing=use_feature_hashing,
+                         feature_bins=5)
     # feature hashing will not work for Naive Bayes since it requires
     # non-negative feature values
     elif model.__name__ == 'MultinomialNB':
         train_fs, test_fs = \
-            make_classification_data(use_feature_hashing=False,
-                                     non_negative=True)
+            _cached_data(make_classification_data,
+                         use_feature_hashing=False,
+                         non_negative=True)
     else:
         train_fs, test_fs = \
-            make_classification_data(use_feature_hashing=use_feature_hashing,
-                                     feature_bins=25)
+            _cached_data(make_classification_data,
+                         use_feature_hashing=use_feature_hashing,
+                         feature_bins=25)
 
     # create the learner with the specified model
     learner = Learner(model.__name__)
@@ -128,10 +153,9 @@ def test_default_param_grids_no_duplicates():
     """
     Verify that the default parameter grids don't contain duplicate values.
     """
-    for learner, param_list in _DEFAULT_PARAM_GRIDS.items():
-        param_dict = param_list[0]
+    for learner, [param_dict] in _DEFAULT_PARAM_GRIDS.items():
         for param_name, values in param_dict.items():
-            assert(len(set(values)) == len(values))
+            assert len(set(values)) == len(values), (learner, param_name)
 
 
 # the runner function for the prediction tests
@@ -215,13 +239,14 @@ def make_rare_class_data():
 
     ids = ['EXAMPLE_{}'.format(n) for n in range(1, 16)]
     y = [0] * 5 + [1] * 5 + [2] * 5
-    X = np.vstack([np.identity(5), np.identity(5), np.identity(5)])
+    X = sp.csr_matrix(np.tile(np.eye(5, dtype=np.float64), (3, 1)))
     feature_names = ['f{}'.format(i) for i in range(1, 6)]
-    features = []
-    for row in X:
-        features.append(dict(zip(feature_names, row)))
 
-    return FeatureSet('rare-class', ids, features=features, labels=y)
+    # use the matrix as it is rather than turning
+    # it into dictionaries that are vectorized again
+    vectorizer = DictVectorizer().fit([dict.fromkeys(feature_names, 1)])
+    return FeatureSet('rare-class', ids, features=X, labels=y,
+                      vectorizer=vectorizer)
 
 
 def test_rare_class():
@@ -245,8 +270,8 @@ def test_rare_class():
 
 
 def check_sparse_predict(learner_name, expected_score, use_feature_hashing=False):
-    train_fs, test_fs = make_sparse_data(
-        use_feature_hashing=use_feature_hashing)
+    train_fs, test_fs = _cached_data(make_sparse_data,
+                                     use_feature_hashing=use_feature_hashing)
 
     # train the given classifier on the training
     # data and evalute on the testing data
@@ -299,8 +324,8 @@ def test_mlp_classification():
 
 
 def check_sparse_predict_sampler(use_feature_hashing=False):
-    train_fs, test_fs = make_sparse_data(
-        use_feature_hashing=use_feature_hashing)
+    train_fs, test_fs = _cached_data(make_sparse_data,
+                                     use_feature_hashing=use_feature_hashing)
 
     if use_feature_hashing:
         sampler = 'RBFSampler'
@@ -323,15 +348,22 @@ def check_sparse_predict_sampler(use_feature_hashing=False):
 
 def check_dummy_classifier_predict(model_args, train_labels, expected_output):
 
-    # create hard-coded featuresets based with known labels
+    # create hard-coded featuresets based with known labels; the
+    # single feature column is used as it is rather than being
+    # turned into dictionaries that are vectorized again
+    vectorizer = DictVectorizer().fit([{"feature": 0}])
+    train_features = sp.csr_matrix(np.arange(20, dtype=np.float64).reshape(-1, 1))
+    test_features = sp.csr_matrix(np.arange(20, 30, dtype=np.float64).reshape(-1, 1))
     train_fs = FeatureSet('classification_train',
                           ['TrainExample{}'.format(i) for i in range(20)],
                           labels=train_labels,
-                          features=[{"feature": i} for i in range(20)])
+                          features=train_features,
+                          vectorizer=vectorizer)
 
     test_fs = FeatureSet('classification_test',
                          ['TestExample{}'.format(i) for i in range(10)],
-                         features=[{"feature": i} for i in range(20, 30)])
+                         features=test_features,
+                         vectorizer=vectorizer)
 
     # Ensure predictions are as expectedfor the given strategy
     learner = Learner('DummyClassifier', model_kwargs=model_args)
@@ -361,8 +393,18 @@ def test_sparse_predict_sampler():
 def make_single_file_featureset_data():
     """
     Write a training file and a test file for tests that check whether
-    specifying train_file and test_file actually works.
+    specifying train_file and test_file actually works. The data is
+    always the same, so the files are only written if they do not
+    exist yet, i.e., by the first of the tests in this module that
+    uses them; they are removed again by `tearDown()`.
     """
+    train_path = join(_my_dir, 'train', 'train_single_file.jsonlines')
+    test_path = join(_my_dir, 'test', 'test_single_file.jsonlines')
+    subset_test_path = join(_my_dir, 'test',
+                            'test_single_file_subset.jsonlines')
+    if exists(train_path) and exists(test_path) and exists(subset_test_path):
+        return
+
     train_fs, test_fs = make_classification_data(num_examples=600,
                                                  train_test_ratio=0.8,
                                                  num_labels=2,
@@ -370,25 +412,23 @@ def make_single_file_featureset_data():
                                                  non_negative=False)
 
     # Write training feature set to a file
-    train_path = join(_my_dir, 'train', 'train_single_file.jsonlines')
     writer = NDJWriter(train_path, train_fs)
     writer.write()
 
     # Write test feature set to a file
-    test_path = join(_my_dir, 'test', 'test_single_file.jsonlines')
     writer = NDJWriter(test_path, test_fs)
     writer.write()
 
     # Also write another test feature set that has fewer features than the training set
     test_fs.filter(features=['f01', 'f02'])
-    test_path = join(_my_dir, 'test', 'test_single_file_subset.jsonlines')
-    writer = NDJWriter(test_path, test_fs)
+    writer = NDJWriter(subset_test_path, test_fs)
     writer.write()
 
 
 def test_train_file_test_file():
     """
-    Test that train_file and test_file experiments work
+    Test that train_file and test_file experiments work and
+    that specifying ablation for them is ignored
     """
     # Create data files
     make_single_file_featureset_data()
@@ -403,7 +443,7 @@ def test_train_file_test_file():
                                                        join(_my_dir, 'test',
                                                             'test_single_file.'
                                                             'jsonlines'))
-    run_configuration(config_path, quiet=True)
+    run_configuration(config_path, quiet=True, ablation=None)
 
     # Check results for objective functions ["accuracy", "f1"]
 
@@ -412,7 +452,7 @@ def test_train_file_test_file():
                                        'single_file.jsonlines_test_test_single'
                                        '_file.jsonlines_RandomForestClassifier'
                                        '_accuracy.results.json'))) as f:
-        result_dict = json.load(f)[0]
+        result_dict = json_loads(f.read())[0]
     assert_almost_equal(result_dict['score'], 0.95)
 
     # objective function f1
@@ -420,9 +460,18 @@ def test_train_file_test_file():
                                        'single_file.jsonlines_test_test_single'
                                        '_file.jsonlines_RandomForestClassifier'
                                        '_f1.results.json'))) as f:
-        result_dict = json.load(f)[0]
+        result_dict = json_loads(f.read())[0]
     assert_almost_equal(result_dict['score'], 0.9491525423728813)
 
+    # check that we see the message that ablation was ignored in the experiment log
+    # Check experiment log output
+    with open(join(_my_dir,
+                   'output',
+                   'train_test_single_file.log')) as f:
+        matches = f.read().count('Not enough featuresets for ablation. '
+                                 'Ignoring.')
+        eq_(matches, 1)
+
 
 def test_predict_on_subset_with_existing_model():
     """
@@ -457,39 +506,10 @@ def test_predict_on_subset_with_existing_model():
                                        'single_file.jsonlines_test_test_single'
                                        '_file_subset.jsonlines_RandomForestClassifier'
                                        '.results.json'))) as f:
-        result_dict = json.load(f)[0]
+        result_dict = json_loads(f.read())[0]
     assert_almost_equal(result_dict['accuracy'], 0.7333333)
 
 
-def test_train_file_test_file_ablation():
-    """
-    Test that specifying ablation with train and test file is ignored
-    """
-    # Create data files
-    make_single_file_featureset_data()
-
-    # Run experiment
-    config_path = fill_in_config_paths_for_single_file(join(_my_dir, "configs",
-                                                            "test_single_file"
-                                                            ".template.cfg"),
-                                                       join(_my_dir, 'train',
-                                                            'train_single_file'
-                                                            '.jsonlines'),
-                                                       join(_my_dir, 'test',
-                                                            'test_single_file.'
-                                                            'jsonlines'))
-    run_configuration(config_path, quiet=True, ablation=None)
-
-    # check that we see the message that ablation was ignored in the experiment log
-    # Check experiment log output
-    with open(join(_my_dir,
-                   'output',
-                   'train_test_single_file.log')) as f:
-        cv_file_pattern = re.compile('Not enough featuresets for ablation. Ignoring.')
-        matches = re.findall(cv_file_pattern, f.read())
-        eq_(len(matches), 1)
-
-
 @raises(ValueError)
 def test_train_file_and_train_directory():
     """
@@ -529,7 +549,7 @@ def test_test_file_and_test_directory():
 
 
 def check_adaboost_predict(base_estimator, algorithm, expected_score):
-    train_fs, test_fs = make_sparse_data()
+    train_fs, test_fs = _cached_data(make_sparse_data)
 
     # train an AdaBoostClassifier on the training data and evalute on the
     # testing data
@@ -636,13 +656,16 @@ def make_float_class_data(labels_as_strings=False):
     y = [1.2] * 25 + [1.5] * 25 + [1.8] * 25
     if labels_as_strings:
         y = list(map(str, y))
-    X = np.vstack([np.identity(25), np.identity(25), np.identity(25)])
+    # only the first five columns of the identity
+    # matrix are used, one for each of the features
+    X = sp.csr_matrix(np.tile(np.eye(25, 5, dtype=np.float64), (3, 1)))
     feature_names = ['f{}'.format(i) for i in range(1, 6)]
-    features = []
-    for row in X:
-        features.append(dict(zip(feature_names, row)))
 
-    return FeatureSet('float-classes', ids, features=features, labels=y)
+    # use the matrix as it is rather than turning
+    # it into dictionaries that are vectorized again
+    vectorizer = DictVectorizer().fit([dict.fromkeys(feature_names, 1)])
+    return FeatureSet('float-classes', ids, features=X, labels=y,
+                      vectorizer=vectorizer)
 
 
 def test_xval_float_classes_as_strings():
@@ -747,17 +770,9 @@ def test_learner_api_load_into_existing_instance():
     Check that `Learner.load()` works as expected
     """
 
-    # create a LinearSVC instance and train it on some data
+    # create a LinearSVC instance and use `load()` to replace
+    # it with a different saved learner
     learner1 = Learner('LinearSVC')
-    (train_fs,
-     test_fs) = make_classification_data(num_examples=200,
-                                         num_features=5,
-                                         use_feature_hashing=False,
-                                         non_negative=True)
-    learner1.train(train_fs, grid_search=False)
-
-    # now use `load()` to replace the existing instance with a
-    # different saved learner
     other_model_file = join(_my_dir, 'other', 'test_load_saved_model.{}.model'.format(sys.version_info[0]))
     learner1.load(other_model_file)
 
@@ -765,7 +780,11 @@ def test_learner_api_load_into_existing_instance():
     # `from_file()`
     learner2 = Learner.from_file(other_model_file)
 
-    # check that the two instances are now basically the same
+    # check that the first instance now has the saved model
+    # and that the two instances are basically the same
+    eq_(learner1.model_type.__name__, 'LogisticRegression')
+    eq_(type(learner1.model).__name__, 'LogisticRegression')
+    eq_(learner1.model.get_params(), learner2.model.get_params())
     eq_(learner1.model_type, learner2.model_type)
     eq_(learner1.model_params, learner2.model_params)
     eq_(learner1.model_kwargs, learner2.model_kwargs)
@@ -773,14 +792,13 @@ def test_learner_api_load_into_existing_instance():
 
 @raises(ValueError)
 def test_hashing_for_multinomialNB():
-    (train_fs, _) = make_classification_data(num_examples=200,
+    (train_fs, _) = make_classification_data(num_examples=4,
+                                             num_features=2,
                                              use_feature_hashing=True)
-    learner = Learner('MultinomialNB', sampler='RBFSampler')
+    learner = Learner('MultinomialNB')
     learner.train(train_fs, grid_search=False)
 
 
 @raises(ValueError)
 def test_sampling_for_multinomialNB():
-    (train_fs, _) = make_classification_data(num_examples=200)
-    learner = Learner('MultinomialNB', sampler='RBFSampler')
-    learner.train(train_fs, grid_search=False)
+    Learner('MultinomialNB', sampler='RBFSampler')
@@ -13,21 +13,26 @@ from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 
 import itertools
+import logging
 import os
+import pickle
 from collections import OrderedDict
 from os.path import abspath, dirname, exists, join
 
 import numpy as np
 import pandas as pd
-from nose.tools import eq_, raises, assert_not_equal
+from nose.tools import eq_, ok_, raises, assert_not_equal, assert_raises
 from nose.plugins.attrib import attr
-from numpy.testing import assert_array_equal
+from nose.plugins.skip import SkipTest
+from numpy.testing import assert_array_equal, assert_array_almost_equal
 from sklearn.feature_extraction import DictVectorizer, FeatureHasher
 from sklearn.datasets.samples_generator import make_classification
 
 import skll
-from skll.data import FeatureSet, Writer, Reader, NDJReader, NDJWriter
-from skll.data.readers import DictListReader
+from skll.data import (FeatureSet, Writer, Reader, CSVReader, CSVWriter,
+                       NDJReader, NDJWriter, ARFFReader)
+from skll.data.readers import (DictListReader, _HAVE_PYARROW,
+                               _is_supported_pyarrow_version)
 from skll.experiments import _load_featureset
 from skll.learner import _DEFAULT_PARAM_GRIDS
 from skll.utilities import skll_convert
@@ -64,6 +69,13 @@ def tearDown():
             os.unlink(filepath)
 
     filepaths = [join(_my_dir, 'other', '{}.jsonlines'.format(x)) for x in ['test_string_ids', 'test_string_ids_df', 'test_string_labels_df']]
+    filepaths.append(join(_my_dir, 'other', 'test_no_comments.libsvm'))
+    filepaths.append(join(_my_dir, 'other', 'test_integral_floats.jsonlines'))
+    filepaths.append(join(_my_dir, 'other', 'test_uppercase_keywords.arff'))
+    filepaths.append(join(_my_dir, 'other', 'test_double_quotes.arff'))
+    filepaths.append(join(_my_dir, 'other', 'test_numeric_types.arff'))
+    filepaths.append(join(_my_dir, 'other', 'test_padded_lines.arff'))
+    filepaths.append(join(_my_dir, 'other', 'test_nominal_ids.arff'))
     for filepath in filepaths:
         if exists(filepath):
             os.unlink(filepath)
@@ -776,6 +788,346 @@ def test_dict_list_reader():
     eq_(converted.vectorizer.get_feature_names(), ['f1', 'f2', 'f3'])
 
 
+def test_csv_reader_pyarrow_engine():
+    """
+    Test that the pyarrow engine reads the same feature set as pandas
+    """
+    if not _HAVE_PYARROW:
+        raise SkipTest('pyarrow is not installed')
+
+    fs, _ = make_classification_data(num_examples=100,
+                                     num_features=4,
+                                     num_labels=3,
+                                     train_test_ratio=1.0,
+                                     random_state=1234)
+    output_path = join(_my_dir, 'output', 'test_pyarrow_engine.csv')
+    CSVWriter(output_path, fs).write()
+
+    fs_pandas = CSVReader(output_path).read()
+    fs_pyarrow = CSVReader(output_path,
+                           pandas_kwargs={'engine': 'pyarrow'}).read()
+    assert fs_pandas == fs_pyarrow
+
+
+def check_supported_pyarrow_version(pyarrow_version, pandas_version,
+                                    expected):
+    eq_(_is_supported_pyarrow_version(pyarrow_version, pandas_version),
+        expected)
+
+
+def test_supported_pyarrow_version():
+    for (pyarrow_version,
+         pandas_version,
+         expected) in [('0.17.1', '0.25.3', False),
+                       ('1.0.1', '1.3.5', False),
+                       ('2.0.0', '0.25.3', True),
+                       ('11.0.0', '0.25.3', True),
+                       ('12.0.1', '0.25.3', False),
+                       ('12.0.1', '1.0.5', True),
+                       ('15.0.0.dev42', '2.1.0rc0', True)]:
+        yield (check_supported_pyarrow_version, pyarrow_version,
+               pandas_version, expected)
+
+
+def check_csv_reader_pyarrow_engine_unsupported_kwargs(pandas_kwargs):
+    pandas_kwargs = dict(pandas_kwargs, engine='pyarrow')
+    assert_raises(ValueError, CSVReader, 'test.csv', pandas_kwargs=pandas_kwargs)
+
+
+def test_csv_reader_pyarrow_engine_unsupported_kwargs():
+    for pandas_kwargs in [{'usecols': ['id', 'y', 'f']},
+                          {'chunksize': 10},
+                          {'sep': '\t', 'nrows': 5}]:
+        yield check_csv_reader_pyarrow_engine_unsupported_kwargs, pandas_kwargs
+
+
+def test_arff_reader_case_insensitive_keywords():
+    """
+    Test that ARFF keywords are recognized regardless of their case
+    """
+    path = join(_my_dir, 'other', 'test_uppercase_keywords.arff')
+    with open(path, 'w') as arff_file:
+        arff_file.write("@RELATION 'test'\n\n"
+                        "@ATTRIBUTE id string\n"
+                        "@Attribute f1 NUMERIC\n"
+                        "@attribute y NUMERIC\n\n"
+                        "@DATA\n"
+                        "'EX1',1.5,2\n"
+                        "'EX2',0,3\n")
+
+    reader = Reader.for_path(path)
+    fs = reader.read()
+    eq_(reader.relation, 'test')
+    ok_(reader.regression)
+    assert_array_equal(fs.ids, ['EX1', 'EX2'])
+    assert_array_equal(fs.labels, [2, 3])
+    assert_array_equal(fs.features.toarray(), [[1.5], [0]])
+
+
+def test_arff_reader_double_quoted_names():
+    """
+    Test that ARFF attribute names can be enclosed in double quotes
+    """
+    path = join(_my_dir, 'other', 'test_double_quotes.arff')
+    with open(path, 'w') as arff_file:
+        arff_file.write("@relation test\n\n"
+                        "@attribute id string\n"
+                        "@attribute \"feature one\" numeric\n"
+                        "@attribute 'feature two' numeric\n"
+                        "@attribute y {a,b}\n\n"
+                        "@data\n"
+                        "'EX1',1,2,a\n"
+                        "'EX2',3,4,b\n")
+
+    fs = Reader.for_path(path).read()
+    eq_(fs.vectorizer.feature_names_, ['feature one', 'feature two'])
+    assert_array_equal(fs.features.toarray(), [[1, 2], [3, 4]])
+
+
+def test_arff_reader_numeric_types():
+    """
+    Test that numeric ARFF attributes are read with and without missing values
+    """
+    path = join(_my_dir, 'other', 'test_numeric_types.arff')
+    with open(path, 'w') as arff_file:
+        arff_file.write("@relation test\n\n"
+                        "@attribute id numeric\n"
+                        "@attribute f1 real\n"
+                        "@attribute f2 integer\n"
+                        "@attribute y numeric\n\n"
+                        "@data\n"
+                        "1,1.5,2,1\n"
+                        "2,0,3,2\n")
+
+    fs = Reader.for_path(path).read()
+    eq_(fs.vectorizer.feature_names_, ['f1', 'f2'])
+    assert_array_equal(fs.features.toarray(), [[1.5, 2], [0, 3]])
+    eq_(fs.ids.tolist(), [1, 2])
+    eq_(fs.labels.tolist(), [1, 2])
+
+    # a missing value means that the types have to be inferred instead
+    with open(path, 'w') as arff_file:
+        arff_file.write("@relation test\n\n"
+                        "@attribute id string\n"
+                        "@attribute f1 numeric\n"
+                        "@attribute y {a,b}\n\n"
+                        "@data\n"
+                        "'EX1',1,a\n"
+                        "'EX2',?,b\n")
+
+    fs = Reader.for_path(path).read()
+    eq_(fs.ids.tolist(), ['EX1', 'EX2'])
+    eq_(fs.labels.tolist(), ['a', 'b'])
+
+
+def test_arff_reader_padded_data_lines():
+    """
+    Test that whitespace around ARFF data lines is not part of the values
+    """
+    path = join(_my_dir, 'other', 'test_padded_lines.arff')
+    with open(path, 'w') as arff_file:
+        arff_file.write("@relation test\n\n"
+                        "@attribute id string\n"
+                        "@attribute f1 {p,q}\n"
+                        "@attribute y {x,z}\n\n"
+                        "@data\n"
+                        "  'a',p,x  \n"
+                        "   \n"
+                        "'b',q,z\t\n")
+
+    for pandas_kwargs in [None, {'engine': 'python'}]:
+        fs = ARFFReader(path, pandas_kwargs=pandas_kwargs).read()
+        eq_(fs.ids.tolist(), ['a', 'b'])
+        eq_(fs.labels.tolist(), ['x', 'z'])
+        eq_(fs.vectorizer.feature_names_, ['f1=p', 'f1=q'])
+
+
+def test_arff_reader_nominal_ids():
+    """
+    Test that nominal ARFF IDs are read into an array, not a categorical
+    """
+    path = join(_my_dir, 'other', 'test_nominal_ids.arff')
+    with open(path, 'w') as arff_file:
+        arff_file.write("@relation test\n\n"
+                        "@attribute id {a,b,c}\n"
+                        "@attribute f1 {p,q}\n"
+                        "@attribute y {x,z}\n\n"
+                        "@data\n"
+                        "a,p,x\n"
+                        "b,q,z\n"
+                        "c,p,z\n")
+
+    fs = Reader.for_path(path).read()
+    ok_(isinstance(fs.ids, np.ndarray))
+    eq_(fs.ids.tolist(), ['a', 'b', 'c'])
+    eq_(fs.vectorizer.feature_names_, ['f1=p', 'f1=q'])
+
+    # slicing and filtering the feature set keeps the array
+    ok_(isinstance(fs[1:].ids, np.ndarray))
+    fs.filter(ids=['a', 'c'])
+    ok_(isinstance(fs.ids, np.ndarray))
+    eq_(fs.ids.tolist(), ['a', 'c'])
+
+
+def test_ndj_reader_integral_float_ids_and_labels():
+    """
+    Test that IDs and labels that are whole floats in NDJ files are ints
+    """
+    path = join(_my_dir, 'other', 'test_integral_floats.jsonlines')
+    with open(path, 'w') as ndj_file:
+        ndj_file.write('{"id": 1.0, "y": 3.0, "x": {"f1": 1}}\n'
+                       '{"id": 2.0, "y": 1.0, "x": {"f1": 2}}\n')
+
+    fs = NDJReader.for_path(path).read()
+    eq_(fs.ids.tolist(), ['1', '2'])
+    eq_(fs.labels.tolist(), [3, 1])
+    eq_(fs.labels.dtype, np.int64)
+
+    # the same file read with `pandas` gives the same feature set
+    expected = NDJReader.for_path(path, pandas_kwargs={'dtype': True}).read()
+    eq_(fs.ids.tolist(), expected.ids.tolist())
+    eq_(fs.labels.tolist(), expected.labels.tolist())
+
+
+def test_csv_reader_chunksize():
+    """
+    Test that reading a CSV file in chunks gives the same feature set
+    """
+    fs, _ = make_classification_data(num_examples=100,
+                                     num_features=4,
+                                     num_labels=3,
+                                     train_test_ratio=1.0,
+                                     random_state=1234)
+    output_path = join(_my_dir, 'output', 'test_chunksize.csv')
+    CSVWriter(output_path, fs).write()
+
+    fs_whole = CSVReader(output_path).read()
+    fs_chunked = CSVReader(output_path,
+                           pandas_kwargs={'chunksize': 30}).read()
+    assert fs_whole == fs_chunked
+
+
+@raises(ValueError)
+def test_csv_reader_chunksize_mixed_types():
+    """
+    Test that reading a CSV file in chunks rejects columns whose type differs
+    """
+    output_path = join(_my_dir, 'output', 'test_chunksize_mixed_types.csv')
+    with open(output_path, 'w') as csv_file:
+        csv_file.write('id,y,f\nEXAMPLE_1,a,1\nEXAMPLE_2,b,2\n'
+                       'EXAMPLE_3,a,x\nEXAMPLE_4,b,3\n')
+    CSVReader(output_path, pandas_kwargs={'chunksize': 2}).read()
+
+
+def test_csv_reader_chunksize_explicit_dtype():
+    """
+    Test that reading a CSV file in chunks with a ``dtype`` matches one read
+    """
+    output_path = join(_my_dir, 'output', 'test_chunksize_mixed_types.csv')
+    with open(output_path, 'w') as csv_file:
+        csv_file.write('id,y,f\nEXAMPLE_1,a,1\nEXAMPLE_2,b,2\n'
+                       'EXAMPLE_3,a,x\nEXAMPLE_4,b,3\n')
+    fs_whole = CSVReader(output_path).read()
+    fs_chunked = CSVReader(output_path,
+                           pandas_kwargs={'chunksize': 2,
+                                          'dtype': {'f': str}}).read()
+    eq_(fs_whole.vectorizer.feature_names_, ['f=1', 'f=2', 'f=3', 'f=x'])
+    assert fs_whole == fs_chunked
+
+
+def test_csv_reader_feature_hashing():
+    """
+    Test that hashing numeric CSV columns directly matches the hasher
+    """
+    fs, _ = make_classification_data(num_examples=100,
+                                     num_features=10,
+                                     num_labels=3,
+                                     train_test_ratio=1.0,
+                                     random_state=1234)
+    output_path = join(_my_dir, 'output', 'test_feature_hashing.csv')
+    CSVWriter(output_path, fs).write()
+
+    fs_hashed = CSVReader(output_path, feature_hasher=True,
+                          num_features=4).read()
+    hasher = FeatureHasher(n_features=4)
+    expected = hasher.transform(fs.vectorizer.inverse_transform(fs.features))
+    assert_array_almost_equal(fs_hashed.features.toarray(),
+                              expected.toarray())
+
+
+def test_libsvm_reader_without_comments():
+    """
+    Test that LibSVM files without SKLL's metadata comments can be read
+    """
+    path = join(_my_dir, 'other', 'test_no_comments.libsvm')
+    with open(path, 'w') as libsvm_file:
+        libsvm_file.write('1 1:1.5 3:2\n0 2:1\n')
+
+    fs = Reader.for_path(path).read()
+    assert_array_equal(fs.ids, ['EXAMPLE_0', 'EXAMPLE_1'])
+    assert_array_equal(fs.labels, [1, 0])
+    eq_(fs.vectorizer.get_feature_names(), ['1', '2', '3'])
+    assert_array_equal(fs.features.toarray(), [[1.5, 0, 2], [0, 1, 0]])
+
+
+def check_reader_dtype(extension, feature_hasher):
+    fs, _ = make_classification_data(num_examples=50, num_features=5,
+                                     train_test_ratio=1.0)
+    path = join(_my_dir, 'output', 'test_dtype{}'.format(extension))
+    Writer.for_path(path, fs, quiet=True).write()
+
+    num_features = 8 if feature_hasher else None
+    fs64 = Reader.for_path(path, feature_hasher=feature_hasher,
+                           num_features=num_features).read()
+    fs32 = Reader.for_path(path, feature_hasher=feature_hasher,
+                           num_features=num_features,
+                           dtype=np.float32).read()
+    eq_(fs64.features.dtype, np.float64)
+    eq_(fs32.features.dtype, np.float32)
+    assert_array_almost_equal(fs64.features.toarray(),
+                              fs32.features.toarray(), decimal=5)
+
+
+def test_reader_dtype():
+    """
+    Test that the readers vectorize features with the given dtype
+    """
+    for extension, feature_hasher in itertools.product(['.csv', '.jsonlines',
+                                                        '.megam'],
+                                                       [False, True]):
+        yield check_reader_dtype, extension, feature_hasher
+
+
+def check_row_reader_in_parallel(extension):
+    fs, _ = make_classification_data(num_examples=500, num_features=10,
+                                     train_test_ratio=1.0)
+    path = join(_my_dir, 'output', 'test_parallel{}'.format(extension))
+    Writer.for_path(path, fs, quiet=True).write()
+
+    fs_serial = Reader.for_path(path).read()
+    fs_parallel = Reader.for_path(path, n_jobs=3).read()
+    assert fs_serial == fs_parallel
+    assert_array_equal(fs_serial.ids, fs_parallel.ids)
+
+    # the reader is pickled for the worker processes, which must
+    # not include its logger, since loggers with handlers cannot
+    # be pickled before Python 3.7
+    logger = logging.getLogger('test_row_reader_in_parallel')
+    logger.addHandler(logging.NullHandler())
+    reader = Reader.for_path(path, n_jobs=3, logger=logger)
+    ok_('logger' not in reader.__getstate__())
+    eq_(pickle.loads(pickle.dumps(reader)).logger.name, 'skll.data.readers')
+    assert reader.read() == fs_serial
+
+
+def test_row_readers_in_parallel():
+    """
+    Test that MegaM and LibSVM files are read the same way in parallel
+    """
+    for extension in ['.megam', '.libsvm']:
+        yield check_row_reader_in_parallel, extension
+
+
 # Tests related to converting featuresets
 def make_conversion_data(num_feat_files, from_suffix, to_suffix, with_labels=True):
     num_examples = 500
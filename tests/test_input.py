@@ -18,6 +18,7 @@ from glob import glob
 from itertools import product
 from os.path import abspath, dirname, exists, join, normpath
 import numpy as np
+import pandas as pd
 
 from nose.tools import eq_, ok_, raises
 from sklearn.utils.testing import assert_equal
@@ -27,7 +28,7 @@ from six import string_types, PY2
 from skll.config import (_parse_config_file,
                          _load_cv_folds,
                          _locate_file)
-from skll.data.readers import safe_float
+from skll.data.readers import safe_float, safe_float_series
 from skll.experiments import _load_featureset
 
 from utils import (create_jsonlines_feature_files,
@@ -77,11 +78,27 @@ def check_safe_float_conversion(converted_val, expected_val):
 
 
 def test_safe_float_conversion():
-    for input_val, expected_val in zip(['1.234', 1.234, '3.0', '3', 3, 'foo'],
-                                       [1.234, 1.234, 3.0, 3, 3, 'foo']):
+    for input_val, expected_val in zip(['1.234', 1.234, '3.0', '3', 3, 'foo',
+                                        '-2.5e3', '.5', ' 7 ', '-inf', '',
+                                        '1.5e', 'foo1', True, -7, 2.5e3],
+                                       [1.234, 1.234, 3.0, 3, 3, 'foo',
+                                        -2500.0, 0.5, 7, float('-inf'), '',
+                                        '1.5e', 'foo1', 'True', -7,
+                                        2500.0]):
         yield check_safe_float_conversion, safe_float(input_val), expected_val
 
 
+def test_safe_float_series_conversion():
+    input_vals = ['1.234', '3', 'foo', '3', 'bar', '1.234']
+    converted = safe_float_series(pd.Series(input_vals))
+    for converted_val, input_val in zip(converted, input_vals):
+        check_safe_float_conversion(converted_val, safe_float(input_val))
+
+    converted = safe_float_series(pd.Series(input_vals),
+                                  replace_dict={'3': 'three', 'foo': 'bar'})
+    eq_(converted.tolist(), [1.234, 'three', 'bar', 'three', 'bar', 1.234])
+
+
 def test_locate_file_valid_paths1():
     """
     Test that `config.locate_file` works with absolute paths.